@@ -0,0 +1,109 @@
+import time
+from collections import OrderedDict
+
+
+class IdempotencyCache:
+    """
+    A time-bounded, memory-bounded cache of results keyed by idempotency key.
+
+    Keys are remembered for ttl seconds and at most max_entries results are kept.
+    Expired results are dropped to make room, but a result is never evicted before
+    its ttl, since a retry of a forgotten key would be processed again; new keys
+    are refused instead while the cache is full.
+
+    Attributes:
+        ttl (float): How long a result is kept, in seconds.
+        max_entries (int): The maximum number of results kept in memory.
+    """
+
+    def __init__(self, ttl: float = 24 * 60 * 60, max_entries: int = 100_000,
+                 clock=time.monotonic):
+        """
+        Constructs all the necessary attributes for the idempotency cache object.
+
+        Args:
+            ttl (float): How long a result is kept, in seconds.
+            max_entries (int): The maximum number of results kept in memory.
+            clock (callable): A function returning the current time in seconds.
+
+        Raises:
+            ValueError: If ttl or max_entries are not positive.
+        """
+        if ttl <= 0 or max_entries <= 0:
+            raise ValueError("Invalid parameters for idempotency cache creation.")
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        # key -> (expiry time, result), ordered by insertion and therefore by expiry
+        self._entries = OrderedDict()
+
+    @property
+    def ttl(self) -> float:
+        """Returns how long a result is kept, in seconds."""
+        return self._ttl
+
+    @property
+    def max_entries(self) -> int:
+        """Returns the maximum number of results kept in memory."""
+        return self._max_entries
+
+    def __len__(self):
+        """Returns the number of results currently kept."""
+        return len(self._entries)
+
+    def has_room(self, key) -> bool:
+        """
+        Checks whether a result can be stored for a key.
+
+        Args:
+            key: The idempotency key to check.
+
+        Returns:
+            bool: True if the key is already stored or there is room for a new key.
+        """
+        if key in self._entries:
+            return True
+        self._drop_expired(self._clock())
+        return len(self._entries) < self._max_entries
+
+    def get(self, key):
+        """
+        Returns the result stored for a key.
+
+        Args:
+            key: The idempotency key to look up.
+
+        Returns:
+            The stored result, or None if the key is unknown or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            return None
+        return entry[1]
+
+    def put(self, key, result):
+        """
+        Stores the result for a key.
+
+        Args:
+            key: The idempotency key.
+            result: The result to return for repeated requests with the same key.
+
+        Raises:
+            ValueError: If the key is new and the cache is full of live results.
+        """
+        now = self._clock()
+        self._entries.pop(key, None)
+        self._drop_expired(now)
+        if len(self._entries) >= self._max_entries:
+            raise ValueError("Too many orders to remember, cannot store a new one.")
+        self._entries[key] = (now + self._ttl, result)
+
+    def _drop_expired(self, now: float):
+        """Drops the results whose ttl has passed."""
+        # Entries are ordered by expiry, so expired ones sit at the front.
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if oldest[0] > now:
+                break
+            self._entries.popitem(last=False)
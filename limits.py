@@ -0,0 +1,232 @@
+import time
+from collections import OrderedDict
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+
+class SlidingWindowCounter:
+    """
+    A memory-bounded sliding-window counter keyed by an arbitrary hashable value.
+
+    The window is split into a fixed number of buckets and each key keeps a total
+    for every bucket it was updated in. The count for a key sums every bucket that
+    overlaps the last window seconds, so it never under-counts; it may over-count by
+    at most one bucket, i.e. a limit may stay in force up to window / buckets longer
+    than the window itself. Lookups and updates take time proportional to the number
+    of buckets a key was updated in, independent of the number of keys.
+
+    At most max_keys keys are tracked, costing about 150 bytes each for a key updated
+    once per window (plus the key itself). Expired keys are dropped to make room, but
+    live keys are never evicted, since forgetting a key would under-count it; new
+    keys are refused instead while the counter is full, so max_keys should be sized
+    for the number of distinct keys expected within one window.
+
+    Attributes:
+        window (float): The length of the sliding window in seconds.
+        buckets (int): The number of buckets the window is split into.
+        max_keys (int): The maximum number of keys kept in memory.
+    """
+
+    def __init__(self, window: float, buckets: int = 24, max_keys: int = 2_000_000,
+                 clock=time.monotonic):
+        """
+        Constructs all the necessary attributes for the counter object.
+
+        Args:
+            window (float): The length of the sliding window in seconds.
+            buckets (int): The number of buckets the window is split into.
+            max_keys (int): The maximum number of keys kept in memory.
+            clock (callable): A function returning the current time in seconds.
+
+        Raises:
+            ValueError: If window, buckets or max_keys are not positive.
+        """
+        if window <= 0 or buckets <= 0 or max_keys <= 0:
+            raise ValueError("Invalid parameters for counter creation.")
+        self._window = window
+        self._buckets = buckets
+        self._width = window / buckets
+        self._max_keys = max_keys
+        self._clock = clock
+        # key -> flat (bucket index, total, bucket index, total, ...) tuple, oldest first
+        self._entries = OrderedDict()
+
+    @property
+    def window(self) -> float:
+        """Returns the length of the sliding window in seconds."""
+        return self._window
+
+    @property
+    def buckets(self) -> int:
+        """Returns the number of buckets the window is split into."""
+        return self._buckets
+
+    @property
+    def max_keys(self) -> int:
+        """Returns the maximum number of keys kept in memory."""
+        return self._max_keys
+
+    def __len__(self):
+        """Returns the number of keys currently tracked."""
+        return len(self._entries)
+
+    def has_room(self, key) -> bool:
+        """
+        Checks whether an amount can be recorded for a key.
+
+        Args:
+            key: The key to check.
+
+        Returns:
+            bool: True if the key is already tracked or there is room for a new key.
+        """
+        if key in self._entries:
+            return True
+        self._drop_expired(self._index())
+        return len(self._entries) < self._max_keys
+
+    def count(self, key) -> int:
+        """
+        Returns the total recorded for a key over the sliding window.
+
+        Args:
+            key: The key to look up.
+
+        Returns:
+            int: The total within the last window seconds, rounded up to whole buckets.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return 0
+        start = self._index() - self._buckets
+        return sum(entry[i + 1] for i in range(0, len(entry), 2) if entry[i] >= start)
+
+    def add(self, key, amount: int = 1):
+        """
+        Records an amount for a key in the current bucket.
+
+        Args:
+            key: The key to record the amount for.
+            amount (int): The amount to record.
+
+        Raises:
+            ValueError: If the key is new and the counter is full of live keys.
+        """
+        index = self._index()
+        entry = self._entries.get(key)
+        if entry is None:
+            self._drop_expired(index)
+            if len(self._entries) >= self._max_keys:
+                raise ValueError("Too many keys tracked, cannot record a new one.")
+            self._entries[key] = (index, amount)
+            return
+        # Drop the buckets that have left the window before adding to the current one.
+        start = index - self._buckets
+        first = 0
+        while first < len(entry) and entry[first] < start:
+            first += 2
+        entry = entry[first:]
+        if entry and entry[-2] == index:
+            entry = entry[:-1] + (entry[-1] + amount,)
+        else:
+            entry += (index, amount)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+    def _index(self) -> int:
+        """Returns the index of the current bucket."""
+        return int(self._clock() // self._width)
+
+    def _drop_expired(self, index: int):
+        """Drops the keys whose buckets have all expired as seen from bucket index."""
+        # Entries are ordered by last update, so expired ones sit at the front.
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if oldest[-2] >= index - self._buckets:
+                break
+            self._entries.popitem(last=False)
+
+
+class PurchaseLimit:
+    """
+    A per-customer purchase limit over a sliding time window, e.g. 1 per day.
+
+    Customers are counted exactly, so the limit is never under-enforced. Memory grows
+    with the number of distinct customers buying within one window, up to
+    max_customers (about 150 bytes each, so roughly 300 MB for the default of two
+    million). Once that many customers are live, new customers are refused until
+    older windows expire, so max_customers should be sized for peak buyers per window.
+
+    Attributes:
+        maximum (int): The maximum quantity a customer may buy within the window.
+        window (float): The length of the window in seconds.
+    """
+
+    def __init__(self, maximum: int, window: float = DAY, buckets: int = 24,
+                 max_customers: int = 2_000_000, clock=time.monotonic):
+        """
+        Constructs all the necessary attributes for the purchase limit object.
+
+        Args:
+            maximum (int): The maximum quantity a customer may buy within the window.
+            window (float): The length of the window in seconds.
+            buckets (int): The number of buckets the window is split into.
+            max_customers (int): The maximum number of customers tracked in memory.
+            clock (callable): A function returning the current time in seconds.
+
+        Raises:
+            ValueError: If maximum is not positive.
+        """
+        if maximum <= 0:
+            raise ValueError("Invalid parameters for purchase limit creation.")
+        self._maximum = maximum
+        self._counter = SlidingWindowCounter(window, buckets, max_customers, clock)
+
+    @property
+    def maximum(self) -> int:
+        """Returns the maximum quantity a customer may buy within the window."""
+        return self._maximum
+
+    @property
+    def window(self) -> float:
+        """Returns the length of the window in seconds."""
+        return self._counter.window
+
+    def __str__(self):
+        """Returns a description of the limit, e.g. '1 per day'."""
+        for unit, seconds in (("week", WEEK), ("day", DAY), ("hour", HOUR), ("minute", MINUTE)):
+            if self.window % seconds == 0:
+                count = int(self.window // seconds)
+                period = unit if count == 1 else f"{count} {unit}s"
+                return f"{self.maximum} per {period}"
+        return f"{self.maximum} per {self.window:g} seconds"
+
+    def check(self, customer: str, quantity: int):
+        """
+        Checks that a customer may buy the given quantity without exceeding the limit.
+
+        Args:
+            customer (str): The customer placing the order.
+            quantity (int): The quantity to buy.
+
+        Raises:
+            ValueError: If the purchase would exceed the limit, or if the customer is new
+                and the limit is already tracking max_customers customers.
+        """
+        if not self._counter.has_room(customer):
+            raise ValueError("Too many customers are being tracked, try again later.")
+        if self._counter.count(customer) + quantity > self.maximum:
+            raise ValueError(f"Cannot purchase more than {self} of this item.")
+
+    def record(self, customer: str, quantity: int):
+        """
+        Records a purchase made by a customer.
+
+        Args:
+            customer (str): The customer who placed the order.
+            quantity (int): The quantity bought.
+        """
+        self._counter.add(customer, quantity)
@@ -1,5 +1,6 @@
 from products import Product, NonStockedProduct, LimitedProduct
 from store import Store
+from limits import PurchaseLimit, DAY
 import promotions
 
 def setup_inventory():
@@ -18,7 +19,8 @@ def setup_inventory():
         Product("Bose QuietComfort Earbuds", price=250, quantity=500),
         Product("Google Pixel 7", price=500, quantity=250),
         NonStockedProduct("Windows License", price=125),
-        LimitedProduct("Shipping", price=10, quantity=250, maximum=1)
+        LimitedProduct("Shipping", price=10, quantity=250, maximum=1,
+                       limits=[PurchaseLimit(maximum=1, window=DAY)])
     ]
     return Store(product_list)
 
@@ -63,6 +65,11 @@ def start(store: Store):
 
         elif choice == "3":
             # Make an order
+            customer = input("Please enter your customer ID: ").strip()
+            if customer == '':
+                print("Customer ID is required to make an order.")
+                continue
+
             products = store.get_all_products()
             order_list = []
             while True:
@@ -94,7 +101,7 @@ def start(store: Store):
             
             if order_list:
                 try:
-                    total_cost = store.order(order_list)
+                    total_cost = store.order(order_list, customer)
                     print(f"********\nOrder made! Total payment: ${total_cost}")
                 except Exception as e:
                     print(f"Error processing order: {e}")
@@ -1,4 +1,5 @@
 from promotions import Promotion
+from limits import PurchaseLimit
 
 
 class Product:
@@ -133,12 +134,14 @@ class Product:
         return (f"{self.name}, Price: ${self.price:.2f},"
                 f" Quantity: {self.quantity}{promo}")
 
-    def buy(self, quantity: int) -> float:
+    def buy(self, quantity: int, customer: str = None) -> float:
         """
         Buys a given quantity of the product, updating the quantity and returning the total price.
 
         Args:
             quantity (int): The quantity to buy.
+            customer (str): The customer placing the order. Ignored here; accepted so that
+                every product can be bought the same way, see LimitedProduct.buy.
 
         Returns:
             float: The total price of the purchase.
@@ -206,12 +209,14 @@ class NonStockedProduct(Product):
                 f" Quantity: Unlimited{promo}")
 
 
-    def buy(self, quantity: int) -> float:
+    def buy(self, quantity: int, customer: str = None) -> float:
         """
         Buys a given quantity of the non-stocked product, returning the total price.
 
         Args:
             quantity (int): The quantity to buy.
+            customer (str): The customer placing the order. Ignored here; accepted so that
+                every product can be bought the same way, see LimitedProduct.buy.
 
         Returns:
             float: The total price of the purchase.
@@ -235,10 +240,12 @@ class LimitedProduct(Product):
     """
     A class to represent a product with a purchase limit in the store.
 
-    Inherits from the Product class, but has a maximum purchase quantity.
+    Inherits from the Product class, but has a maximum purchase quantity per order
+    and, optionally, per-customer purchase limits over time windows.
     """
 
-    def __init__(self, name: str, price: float, quantity: int, maximum: int):
+    def __init__(self, name: str, price: float, quantity: int, maximum: int,
+                 limits: list = None):
         """
         Constructs all the necessary attributes for the limited product object.
 
@@ -247,31 +254,62 @@ class LimitedProduct(Product):
             price (float): The price of the product.
             quantity (int): The quantity of the product.
             maximum (int): The maximum purchase quantity for the product.
+            limits (list): PurchaseLimit objects enforced per customer.
         """
         super().__init__(name, price, quantity)
         self._maximum = maximum
+        self._limits = list(limits) if limits else []
 
     @property
     def maximum(self) -> int:
         """Returns the maximum purchase quantity for the product."""
         return self._maximum
 
-    def buy(self, quantity: int) -> float:
+    @property
+    def limits(self) -> list:
+        """Returns the per-customer purchase limits for the product."""
+        return list(self._limits)
+
+    def add_limit(self, limit: PurchaseLimit):
+        """
+        Adds a per-customer purchase limit to the product.
+
+        Args:
+            limit (PurchaseLimit): The limit to enforce.
+        """
+        self._limits.append(limit)
+
+    def buy(self, quantity: int, customer: str = None) -> float:
         """
         Buys a given quantity of the limited product, updating the quantity and returning the total price.
 
         Args:
             quantity (int): The quantity to buy.
+            customer (str): The customer placing the order. Required if the product has
+                per-customer limits.
 
         Returns:
             float: The total price of the purchase.
 
         Raises:
-            ValueError: If the quantity is less than or equal to 0, more than the available quantity, or more than the maximum allowed.
+            ValueError: If the quantity is less than or equal to 0, more than the available quantity,
+                more than the maximum allowed, over a per-customer limit, or if the customer is
+                missing for a product with per-customer limits.
         """
+        if quantity <= 0:
+            raise ValueError("Quantity must be greater than 0.")
+        if quantity > self.quantity:
+            raise ValueError("Not enough quantity available.")
         if quantity > self.maximum:
             raise ValueError(f"Cannot purchase more than {self.maximum} of this item.")
-        return super().buy(quantity)
+        if self._limits and customer is None:
+            raise ValueError("A customer is required to purchase this item.")
+        for limit in self._limits:
+            limit.check(customer, quantity)
+        total_price = super().buy(quantity)
+        for limit in self._limits:
+            limit.record(customer, quantity)
+        return total_price
 
     def show(self) -> str:
         """
@@ -281,6 +319,7 @@ class LimitedProduct(Product):
             str: A string representation of the product.
         """
         promo = f", Promotion: {self.promotion.name}" if self.promotion else ", Promotion: None"
+        limits = "".join(f", Limited to {limit} per customer!" for limit in self._limits)
         return (f"{self.name}, Price: ${self.price:.2f}, "
                 f"Limited to {self.maximum} per order!"
-                f"{promo}")
+                f"{limits}{promo}")
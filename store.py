@@ -1,4 +1,7 @@
+from itertools import islice
+
 from products import Product
+from idempotency import IdempotencyCache
 
 
 class Store:
@@ -9,14 +12,16 @@ class Store:
         product_list (list): A list of Product objects available in the store.
     """
 
-    def __init__(self, product_list: list):
+    def __init__(self, product_list: list, order_cache: IdempotencyCache = None):
         """
         Constructs all the necessary attributes for the store object.
 
         Args:
             product_list (list): A list of Product objects available in the store.
+            order_cache (IdempotencyCache): The cache used to detect repeated orders.
         """
         self.product_list = product_list
+        self._order_cache = order_cache if order_cache is not None else IdempotencyCache()
 
     def add_product(self, product: Product):
         """
@@ -54,20 +59,58 @@ class Store:
         """
         return [product for product in self.product_list if product.is_active()]
 
-    def order(self, shopping_list: list) -> float:
+    def order(self, shopping_list: list, customer: str = None,
+              idempotency_key: str = None) -> float:
         """
         Processes an order and returns the total price.
 
+        Repeating an order with the same idempotency key returns the stored
+        total without buying the products again, and reusing a key for a
+        different order is an error. If an attempt is interrupted by an
+        unexpected error, the lines already processed are remembered and a
+        retry with the same key only processes the remaining ones. Keys are
+        remembered for the cache's ttl; while the cache is full of live keys,
+        orders with a new key are refused rather than forgetting an earlier
+        one.
+
         Args:
             shopping_list (list): A list of tuples containing products and quantities to purchase.
+            customer (str): The customer placing the order, used for per-customer limits.
+            idempotency_key (str): A unique key identifying the order, if any.
 
         Returns:
             float: Total price of the order.
+
+        Raises:
+            ValueError: If the idempotency key was used for a different order,
+                or is new and the order cache is full.
         """
+        processed = 0
         total_price = 0
-        for product, quantity in shopping_list:
-            try:
-                total_price += product.buy(quantity)
-            except ValueError as e:
-                print(f"Could not process order for {product.name}: {e}")
+        if idempotency_key is not None:
+            shopping_list = list(shopping_list)
+            fingerprint = (customer, tuple((product.name, quantity)
+                                           for product, quantity in shopping_list))
+            cached = self._order_cache.get(idempotency_key)
+            if cached is not None:
+                cached_fingerprint, processed, total_price = cached
+                if cached_fingerprint != fingerprint:
+                    raise ValueError("Idempotency key was already used for a different order.")
+                if processed == len(shopping_list):
+                    return total_price
+            elif not self._order_cache.has_room(idempotency_key):
+                raise ValueError("Too many recent orders, try again later.")
+
+        try:
+            for product, quantity in islice(shopping_list, processed, None):
+                try:
+                    total_price += product.buy(quantity, customer)
+                except ValueError as e:
+                    print(f"Could not process order for {product.name}: {e}")
+                processed += 1
+        finally:
+            # Remember how far the order got, so a retry after an interruption
+            # never buys the lines that were already bought a second time.
+            if idempotency_key is not None:
+                self._order_cache.put(idempotency_key, (fingerprint, processed, total_price))
         return total_price
@@ -1,6 +1,7 @@
 import pytest
 from products import Product, NonStockedProduct, LimitedProduct
 from promotions import PercentDiscount
+from limits import PurchaseLimit, DAY, WEEK
 
 
 def test_create_product():
@@ -60,3 +61,88 @@ def test_limited_product():
         limited_product.buy(6)  # Exceeds the maximum purchase limit
     total_price = limited_product.buy(5)
     assert total_price == 250  # 5 * 50
+
+
+def test_limited_product_per_customer_limit(clock):
+    daily = PurchaseLimit(maximum=1, window=DAY, clock=clock)
+    limited_product = LimitedProduct(name="Limited Product", price=10, quantity=100,
+                                     maximum=1, limits=[daily])
+    assert limited_product.buy(1, customer="alice") == 10
+    with pytest.raises(ValueError):
+        limited_product.buy(1, customer="alice")  # Same customer, same day
+    assert limited_product.buy(1, customer="bob") == 10
+    assert limited_product.quantity == 98
+
+    clock.advance(2 * DAY)
+    assert limited_product.buy(1, customer="alice") == 10
+
+
+def test_limited_product_requires_customer():
+    limited_product = LimitedProduct(name="Limited Product", price=10, quantity=100,
+                                     maximum=1, limits=[PurchaseLimit(maximum=1)])
+    with pytest.raises(ValueError):
+        limited_product.buy(1)
+    assert limited_product.quantity == 100
+
+
+def test_limited_product_per_customer_limit_when_full():
+    daily = PurchaseLimit(maximum=1, window=DAY, max_customers=2)
+    limited_product = LimitedProduct(name="Limited Product", price=10, quantity=100,
+                                     maximum=1, limits=[daily])
+    limited_product.buy(1, customer="a")
+    limited_product.buy(1, customer="b")
+    with pytest.raises(ValueError):
+        limited_product.buy(1, customer="c")  # Table is full of live customers
+    with pytest.raises(ValueError):
+        limited_product.buy(1, customer="a")  # "a" must not have been evicted
+    assert limited_product.quantity == 98
+
+
+def test_limited_product_per_customer_limit_across_window_boundary(clock):
+    clock.now = 0.99 * DAY
+    daily = PurchaseLimit(maximum=2, window=DAY, clock=clock)
+    limited_product = LimitedProduct(name="Limited Product", price=10, quantity=100,
+                                     maximum=2, limits=[daily])
+    limited_product.buy(2, customer="alice")
+
+    clock.now = 1.5 * DAY
+    with pytest.raises(ValueError):
+        limited_product.buy(1, customer="alice")  # 3 within less than a day
+    clock.now = 1.98 * DAY
+    with pytest.raises(ValueError):
+        limited_product.buy(1, customer="alice")
+
+    clock.now = 2.05 * DAY
+    assert limited_product.buy(2, customer="alice") == 20
+    assert limited_product.quantity == 96
+
+
+def test_limited_product_validates_quantity_before_limits():
+    daily = PurchaseLimit(maximum=1, max_customers=1)
+    limited_product = LimitedProduct(name="Limited Product", price=10, quantity=1,
+                                     maximum=5, limits=[daily])
+    limited_product.buy(1, customer="alice")  # Fills the limit's customer table
+    with pytest.raises(ValueError, match="greater than 0"):
+        limited_product.buy(0, customer="bob")
+    with pytest.raises(ValueError, match="Not enough quantity"):
+        limited_product.buy(2, customer="bob")
+
+
+def test_limited_product_show_per_customer_limits():
+    limited_product = LimitedProduct(name="Shipping", price=10, quantity=250, maximum=1,
+                                     limits=[PurchaseLimit(maximum=1, window=DAY),
+                                             PurchaseLimit(maximum=3, window=2 * WEEK)])
+    assert limited_product.show() == ("Shipping, Price: $10.00, Limited to 1 per order!, "
+                                      "Limited to 1 per day per customer!, "
+                                      "Limited to 3 per 2 weeks per customer!, Promotion: None")
+
+
+def test_limited_product_per_customer_limit_many_customers():
+    daily = PurchaseLimit(maximum=1, window=DAY)
+    limited_product = LimitedProduct(name="Limited Product", price=10, quantity=200_000,
+                                     maximum=1, limits=[daily])
+    for customer in range(150_000):
+        limited_product.buy(1, customer=str(customer))
+    with pytest.raises(ValueError):
+        limited_product.buy(1, customer="0")
+    assert limited_product.quantity == 50_000
@@ -1,6 +1,9 @@
 import pytest
 from store import Store
-from products import Product
+from products import Product, LimitedProduct
+from promotions import Promotion
+from limits import PurchaseLimit
+from idempotency import IdempotencyCache
 
 
 def test_store_initialization():
@@ -34,3 +37,132 @@ def test_store_order():
     assert total_price == 900  # 5 * 100 + 2 * 200
     assert product1.quantity == 5
     assert product2.quantity == 18
+
+
+def test_store_order_per_customer_limit():
+    limit = PurchaseLimit(maximum=1)
+    shipping = LimitedProduct(name="Shipping", price=10, quantity=250, maximum=1, limits=[limit])
+    store = Store(product_list=[shipping])
+    assert store.order([(shipping, 1)], customer="alice") == 10
+    assert store.order([(shipping, 1)], customer="alice") == 0  # Repeated order is rejected
+    assert shipping.quantity == 249
+
+
+def test_store_order_idempotency_key(clock):
+    cache = IdempotencyCache(ttl=60, clock=clock)
+    product = Product(name="Product", price=100, quantity=10)
+    store = Store(product_list=[product], order_cache=cache)
+    assert store.order([(product, 2)], idempotency_key="order-1") == 200
+    assert store.order([(product, 2)], idempotency_key="order-1") == 200  # Retry
+    assert product.quantity == 8
+    assert store.order([(product, 2)], idempotency_key="order-2") == 200
+    assert product.quantity == 6
+
+    clock.advance(61)  # Key has expired
+    assert store.order([(product, 2)], idempotency_key="order-1") == 200
+    assert product.quantity == 4
+
+
+def test_store_order_without_customer_is_rejected_for_limited_product():
+    shipping = LimitedProduct(name="Shipping", price=10, quantity=250, maximum=1,
+                              limits=[PurchaseLimit(maximum=1)])
+    store = Store(product_list=[shipping])
+    assert store.order([(shipping, 1)]) == 0
+    assert store.order([(shipping, 1)]) == 0
+    assert shipping.quantity == 250
+
+
+def test_store_order_idempotency_cache_full(clock):
+    cache = IdempotencyCache(ttl=60, max_entries=2, clock=clock)
+    product = Product(name="Product", price=1, quantity=100)
+    store = Store(product_list=[product], order_cache=cache)
+    store.order([(product, 1)], idempotency_key="k1")
+    store.order([(product, 1)], idempotency_key="k2")
+    with pytest.raises(ValueError):
+        store.order([(product, 1)], idempotency_key="k3")  # Cache is full of live keys
+    assert store.order([(product, 1)], idempotency_key="k1") == 1  # k1 was not evicted
+    assert product.quantity == 98
+
+    clock.advance(61)  # Expired keys make room again
+    store.order([(product, 1)], idempotency_key="k3")
+    assert len(cache) == 1
+    assert product.quantity == 97
+
+
+def test_store_order_idempotency_key_reused_for_different_order():
+    product = Product(name="Product", price=10, quantity=100)
+    store = Store(product_list=[product])
+    assert store.order([(product, 1)], idempotency_key="k") == 10
+    with pytest.raises(ValueError):
+        store.order([(product, 50)], idempotency_key="k")
+    with pytest.raises(ValueError):
+        store.order([(product, 1)], customer="alice", idempotency_key="k")
+    assert product.quantity == 99
+
+
+class BrokenPromotion(Promotion):
+    def apply_promotion(self, product, quantity: int) -> float:
+        raise RuntimeError("Promotion service unavailable.")
+
+
+def test_store_order_idempotency_key_with_failed_items():
+    product1 = Product(name="Product 1", price=100, quantity=10)
+    product2 = Product(name="Product 2", price=200, quantity=1)
+    store = Store(product_list=[product1, product2])
+    order = [(product1, 2), (product2, 5)]  # Not enough of product 2
+    assert store.order(order, idempotency_key="k") == 200
+    assert store.order(order, idempotency_key="k") == 200
+    assert product1.quantity == 8
+    assert product2.quantity == 1
+
+
+def test_store_order_idempotency_key_after_interrupted_order():
+    product1 = Product(name="Product 1", price=100, quantity=10)
+    product2 = Product(name="Product 2", price=200, quantity=10,
+                       promotion=BrokenPromotion("Broken"))
+    product3 = Product(name="Product 3", price=300, quantity=10)
+    store = Store(product_list=[product1, product2, product3])
+    order = [(product1, 2), (product2, 1), (product3, 1)]
+    with pytest.raises(RuntimeError):
+        store.order(order, idempotency_key="k")
+    assert product1.quantity == 8
+
+    product2.promotion = None  # The transient failure has cleared
+    assert store.order(order, idempotency_key="k") == 700  # Finishes the remaining lines
+    assert store.order(order, idempotency_key="k") == 700
+    assert (product1.quantity, product2.quantity, product3.quantity) == (8, 9, 9)
+
+
+def test_store_order_idempotency_key_after_failed_first_line():
+    product = Product(name="Product", price=10, quantity=10,
+                      promotion=BrokenPromotion("Broken"))
+    store = Store(product_list=[product])
+    with pytest.raises(RuntimeError):
+        store.order([(product, 1)], idempotency_key="k")
+    assert product.quantity == 10
+
+    product.promotion = None
+    assert store.order([(product, 1)], idempotency_key="k") == 10
+    assert product.quantity == 9
+
+
+def test_store_order_idempotency_keys_across_several_ttls(clock):
+    cache = IdempotencyCache(ttl=60, max_entries=2, clock=clock)
+    product = Product(name="Product", price=1, quantity=100)
+    store = Store(product_list=[product], order_cache=cache)
+    for ttl in range(5):
+        store.order([(product, 1)], idempotency_key=f"a{ttl}")
+        clock.advance(30)
+        store.order([(product, 1)], idempotency_key=f"b{ttl}")
+        assert store.order([(product, 1)], idempotency_key=f"a{ttl}") == 1  # Still live
+        clock.advance(31)
+        assert len(cache) <= 2
+    assert product.quantity == 90
+
+
+def test_store_order_accepts_iterators():
+    product = Product(name="Product", price=100, quantity=10)
+    store = Store(product_list=[product])
+    assert store.order((product, 1) for _ in range(2)) == 200
+    assert store.order(((product, 1) for _ in range(2)), idempotency_key="k") == 200
+    assert product.quantity == 6